@@ -4,13 +4,16 @@ import sys
 
 API_BASE = "http://127.0.0.1:8001/api/police"
 
+# One keep-alive connection for the whole run instead of a new one per request
+_SESSION = requests.Session()
+
 def test_endpoint(name, method, endpoint, data=None):
     print(f"Testing {name} ({endpoint})...", end=" ", flush=True)
     try:
         if method == "GET":
-            response = requests.get(f"{API_BASE}{endpoint}")
+            response = _SESSION.get(f"{API_BASE}{endpoint}")
         else:
-            response = requests.post(f"{API_BASE}{endpoint}", json=data)
+            response = _SESSION.post(f"{API_BASE}{endpoint}", json=data)
         
         if response.status_code == 200:
             print("✅ SUCCESS")
@@ -1,32 +1,61 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import orjson
 import sys
 import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
-API_URL = "http://127.0.0.1:8001/api"
+BASE_URL = "http://127.0.0.1:8001"
+API_URL = f"{BASE_URL}/api"
 API_KEY = "sk_test_123456789"
 
+# One pooled keep-alive session for the whole suite instead of a new connection per request
+_SESSION = requests.Session()
+# Local plaintext target: no retries, no redirect following, and short explicit
+# (connect, read) timeouts so a hung server fails a case instead of stalling the suite
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0, pool_block=False)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+_POST_OPTIONS = {"allow_redirects": False, "timeout": (0.5, 5)}
+# Bodies are pre-encoded with orjson and sent as data=, so the JSON content type is set here
+_SESSION.headers.update({"x-api-key": API_KEY, "Content-Type": "application/json"})
+
+# Colored "[STATUS] " prefixes, built once per status
+_LOG_RESET = "\033[0m"
+_LOG_PREFIXES = {status: f"{color}[{status}] " for status, color in (("INFO", "\033[94m"), ("SUCCESS", "\033[92m"), ("ERROR", "\033[91m"))}
+
 def log(msg, status="INFO"):
-    colors = {"INFO": "\033[94m", "SUCCESS": "\033[92m", "ERROR": "\033[91m", "RESET": "\033[0m"}
-    print(f"{colors.get(status, '')}[{status}] {msg}{colors['RESET']}")
+    prefix = _LOG_PREFIXES.get(status) or f"[{status}] "
+    # A single write per line, so lines from concurrently running cases never interleave
+    sys.stdout.write(prefix + msg + _LOG_RESET + "\n")
+
+# Invariant honeypot request body; each case only fills in the message text
+_PAYLOAD_TEMPLATE = {
+    "sessionId": "TEST-123",
+    "message": {
+        "sender": "scammer",
+        "text": None,
+        "timestamp": "2024-01-01T12:00:00Z"
+    },
+    "metadata": {"persona": "skeptic"}
+}
+
+# Extraction checks: if the input contains the needle, the intel field must be non-empty
+_INTEL_CHECKS = (
+    ("http", "phishingLinks", "Failed to extract link"),
+    ("9999999999", "phoneNumbers", "Failed to extract phone number"),
+)
 
 def test_honeypot(text, expected_intent=None):
     url = f"{API_URL}/honeypot"
-    headers = {"x-api-key": API_KEY, "Content-Type": "application/json"}
-    payload = {
-        "sessionId": "TEST-123",
-        "message": {
-            "sender": "scammer",
-            "text": text,
-            "timestamp": "2024-01-01T12:00:00Z"
-        },
-        "metadata": {"persona": "skeptic"}
-    }
+    payload = {**_PAYLOAD_TEMPLATE, "message": {**_PAYLOAD_TEMPLATE["message"], "text": text}}
     
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = _SESSION.post(url, data=orjson.dumps(payload), **_POST_OPTIONS)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             intent = data['ml_analysis']['intent']
             reply = data['reply']
             intel = data['extracted_intelligence']
@@ -38,12 +67,10 @@ def test_honeypot(text, expected_intent=None):
                 return False
                 
             # Check intelligence extraction
-            if "http" in text and not intel['phishingLinks']:
-                log("Failed to extract link", "ERROR")
-                return False
-            if "9999999999" in text and not intel['phoneNumbers']:
-                log("Failed to extract phone number", "ERROR")
-                return False
+            for needle, field, error in _INTEL_CHECKS:
+                if needle in text and not intel[field]:
+                    log(error, "ERROR")
+                    return False
                 
             return True
         else:
@@ -53,53 +80,110 @@ def test_honeypot(text, expected_intent=None):
         log(f"Exception: {e}", "ERROR")
         return False
 
+class CheckFailed(Exception):
+    """Non-200 reply from /api/check; raised so the failure is never memoized"""
+
+@functools.lru_cache(maxsize=256)
+def _check_raw(type, value):
+    # The checkers are pure functions of (type, value), so repeat checks in one run
+    # reuse the first successful response. Failures raise, and lru_cache never
+    # stores a raised call, so the next attempt goes back to the server.
+    response = _SESSION.post(f"{API_URL}/check", data=orjson.dumps({"type": type, "value": value}), **_POST_OPTIONS)
+    if response.status_code != 200:
+        raise CheckFailed(response.text)
+    data = orjson.loads(response.content)
+    return data.get('score'), data.get('risk')
+
 def test_check(type, value):
-    url = f"{API_URL}/check"
     try:
-        response = requests.post(url, json={"type": type, "value": value})
+        score, risk = _check_raw(type, value)
+        log(f"Check {type} ({value}): Score {score} | Risk: {risk}", "SUCCESS")
+        return True
+    except CheckFailed as e:
+        log(f"Check API Failed: {e}", "ERROR")
+        return False
+    except Exception as e:
+        log(f"Exception: {e}", "ERROR")
+        return False
+
+def test_batch(texts):
+    url = f"{API_URL}/honeypot/batch"
+    payload = {"messages": texts, "metadata": {"persona": "skeptic"}}
+
+    try:
+        response = _SESSION.post(url, data=orjson.dumps(payload), **_POST_OPTIONS)
         if response.status_code == 200:
-            data = response.json()
-            log(f"Check {type} ({value}): Score {data.get('score')} | Risk: {data.get('risk')}", "SUCCESS")
+            data = orjson.loads(response.content)
+            if data.get('count') != len(texts):
+                log(f"Batch returned {data.get('count')} results for {len(texts)} messages", "ERROR")
+                return False
+            intents = [r['ml_analysis']['intent'] for r in data['results']]
+            log(f"Batch of {len(texts)} -> Intents: {intents}", "SUCCESS")
             return True
         else:
-            log(f"Check API Failed: {response.text}", "ERROR")
+            log(f"Batch API Failed: {response.text}", "ERROR")
             return False
     except Exception as e:
         log(f"Exception: {e}", "ERROR")
         return False
 
-def run_tests():
-    log("Starting National Competition Validation Suite...", "INFO")
-    time.sleep(1) # Wait for server cold start
-    
-    passes = 0
-    total = 0
-    
+# Validation cases as (kind, *args), dispatched to the matching test_* runner
+CASES = (
     # 1. Test Urgency Scam
-    total += 1
-    if test_honeypot("Your account is blocked. Click here immediately.", "scam_urgency"): passes += 1
-    
+    ("honeypot", "Your account is blocked. Click here immediately.", "scam_urgency"),
     # 2. Test Greed Scam
-    total += 1
-    if test_honeypot("You have won a lottery of 5 Crores! Send bank details.", "scam_greed"): passes += 1
-    
+    ("honeypot", "You have won a lottery of 5 Crores! Send bank details.", "scam_greed"),
     # 3. Test Threat Scam
-    total += 1
-    if test_honeypot("I am calling from Police Station. FIR registered against you.", "scam_fear"): passes += 1
-    
+    ("honeypot", "I am calling from Police Station. FIR registered against you.", "scam_fear"),
     # 4. Test Extraction
-    total += 1
-    if test_honeypot("Pay now at http://evil-bank.com or call 9999999999", "scam_link"): passes += 1
-    
+    ("honeypot", "Pay now at http://evil-bank.com or call 9999999999", "scam_link"),
     # 5. Test Tools
-    total += 1
-    if test_check("link", "http://fake-bank-login.xyz"): passes += 1
-    
-    total += 1
-    if test_check("phone", "+923001234567"): passes += 1
+    ("check", "link", "http://fake-bank-login.xyz"),
+    ("check", "phone", "+923001234567"),
+    ("check", "upi", "lotterywinner@oksbi"),
+    # 6. Test Batch Triage
+    ("batch", ("Your account is blocked. Click here immediately.", "You have won a lottery of 5 Crores!")),
+)
+
+_RUNNERS = {"honeypot": test_honeypot, "check": test_check, "batch": test_batch}
+
+def run_case(case):
+    kind, *args = case
+    return _RUNNERS[kind](*args)
+
+def wait_for_server(timeout=5.0):
+    # Poll the root status route until the server answers, instead of a fixed sleep:
+    # a warm server is used immediately, a cold one as soon as it is up
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if _SESSION.get(f"{BASE_URL}/", timeout=0.2).status_code == 200:
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.05)
+    log(f"Server at {BASE_URL} not ready after {timeout}s", "ERROR")
+    return False
+
+def run_tests():
+    try:
+        _run_tests()
+    finally:
+        _SESSION.close()
+
+def _run_tests():
+    log("Starting National Competition Validation Suite...", "INFO")
+    # Every run must hit the live server; never replay a previous run's checks
+    _check_raw.cache_clear()
+    wait_for_server()
     
-    total += 1
-    if test_check("upi", "lotterywinner@oksbi"): passes += 1
+    # The cases are independent, so fan them out over the pooled session; requests
+    # releases the GIL on socket I/O, making wall time ~ the slowest case, not the sum.
+    # Results come back in case order; log lines print as cases finish.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run_case, CASES))
+    passes = sum(results)
+    total = len(CASES)
 
     print("-" * 30)
     if passes == total: